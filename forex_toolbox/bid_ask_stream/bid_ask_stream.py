@@ -7,11 +7,162 @@ in _minute_iter docstring
 import os
 import re
 import zipfile
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pytz
 import pandas as pd
 import numpy as np
+import pyarrow.parquet as pq
 from ..utils import resample
 from zipline.utils.cli import maybe_show_progress
 
+# compiled once; stripping to the digits is the sort key for monthly
+# zip and csv names
+_DIGITS_RE = re.compile(r'\D+')
+
+
+def prefetch(gen, n=4):
+    """
+    Runs ``gen`` on a producer thread feeding a bounded queue, so the
+    consumer can process one item while the next is being produced.
+    Items come out in order; producer errors are re-raised here.
+
+    When the consumer stops early, the producer notices the abandoned
+    queue and closes ``gen``, so resources held inside a suspended
+    generator (like _minute_iter's process pool) unwind instead of
+    leaking behind a put that never returns.
+    """
+    q = queue.Queue(maxsize=n)
+    stop = threading.Event()
+
+    def _put(msg):
+        while not stop.is_set():
+            try:
+                q.put(msg, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce():
+        try:
+            try:
+                for item in gen:
+                    if not _put(('item', item)):
+                        return
+                _put(('done', None))
+            except BaseException as e:
+                _put(('error', e))
+        finally:
+            # no-op once gen is exhausted; throws GeneratorExit into a
+            # suspended gen so its with-blocks run when we quit early
+            gen.close()
+
+    threading.Thread(target=_produce, daemon=True).start()
+    try:
+        while True:
+            kind, value = q.get()
+            if kind == 'item':
+                yield value
+            elif kind == 'error':
+                raise value
+            else:
+                return
+    finally:
+        stop.set()
+
+
+def _load_instrument(index, name, current_dir):
+    """
+    Parses one instrument folder into minute ohlc chunks.
+
+    Runs in a worker process, so it returns everything the caller
+    needs -- the chunks plus the instrument's date range -- instead
+    of mutating shared state.
+
+    Returns
+    -------
+    (index, chunks, start_ts, end_ts)
+    """
+    chunks = []
+    # plain Timestamp sentinels; comparing and updating locals avoids a
+    # pandas scalar-indexing op per csv chunk
+    start_ts = pd.Timestamp.max.replace(tzinfo=pytz.UTC)
+    end_ts = pd.Timestamp.min.replace(tzinfo=pytz.UTC)
+
+    # ensure data is ingested chronologically; DirEntry objects carry
+    # the file type from the directory scan, saving a stat per name
+    with os.scandir(current_dir) as entries:
+        zips = sorted((e for e in entries
+                       if e.name.endswith(".zip") and e.is_file()),
+                      key=lambda e: (int(_DIGITS_RE.sub('', e.name)), e.name))
+    for z in zips:
+        zip_path = z.path
+        pq_path = os.path.splitext(zip_path)[0] + '.parquet'
+        if not os.path.exists(pq_path):
+            if not _convert_zip_to_parquet(zip_path, pq_path):
+                # zip held no csv members
+                continue
+
+        ticks = pq.read_table(pq_path,
+                              columns=['datetime', 'bid', 'ask'],
+                              use_threads=True) \
+                  .to_pandas(split_blocks=True, self_destruct=True)
+        ohlc = resample.ticks_to_ohlc(ticks)
+
+        if ohlc.index[0] < start_ts:
+            start_ts = ohlc.index[0]
+        if ohlc.index[-1] > end_ts:
+            end_ts = ohlc.index[-1]
+        chunks.append(ohlc)
+
+    if not chunks:
+        return index, chunks, None, None
+    return index, chunks, start_ts, end_ts
+
+
+def _convert_zip_to_parquet(zip_path, pq_path):
+    """
+    One-time conversion of a monthly zip of tick csvs into a snappy
+    compressed parquet twin, so repeat ingests decompress binary
+    columns instead of re-parsing text.
+
+    Writes through a temp file and renames into place only on success;
+    an interrupted conversion would otherwise leave a valid-footered
+    but truncated parquet that later ingests silently trust.
+
+    Returns
+    -------
+    converted : bool
+        False when the zip held no csv members (no file is written)
+    """
+    tmp_path = pq_path + '.tmp'
+    writer = None
+    try:
+        with zipfile.ZipFile(zip_path, 'r') as zfile:
+            csvs = sorted(filter(lambda x: ".csv" in x, zfile.namelist()),
+                          key=lambda x: (int(_DIGITS_RE.sub('', x)), x))
+            for minute_csv in csvs:
+                with zfile.open(minute_csv) as fh:
+                    table = resample.bid_ask_table(fh)
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp_path, table.schema,
+                                              compression='snappy')
+                writer.write_table(table, row_group_size=100000)
+    except BaseException:
+        if writer is not None:
+            writer.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    if writer is None:
+        return False
+    writer.close()
+    os.rename(tmp_path, pq_path)
+    return True
+
 
 def ingest(environ,
            asset_db_writer,
@@ -48,22 +199,19 @@ def ingest(environ,
     path = environ.get('BID_ASK_STREAM_CSV_FOLDER')
     instruments = os.listdir(path)  # get ["EURSD", "AUDUSD"]
 
-    # init metadata
-    metadata = pd.DataFrame(np.empty(len(instruments), dtype=[
+    # init metadata storage; rows are filled with plain numpy writes
+    # and only wrapped into a DataFrame once everything is ingested
+    meta_arr = np.empty(len(instruments), dtype=[
         ('start_date',      'datetime64[ns]'),
         ('end_date',        'datetime64[ns]'),
         ('auto_close_date', 'datetime64[ns]'),
         ('exchange',        'object'),
         ('symbol',          'object'),
         ('asset_name',      'object'),
-        ]))
-    metadata['start_date'] = metadata.start_date.dt.tz_localize('UTC')
-    metadata['end_date'] = metadata.end_date.dt.tz_localize('UTC')
-    metadata['auto_close_date'] = metadata.auto_close_date.dt.tz_localize('UTC')
-
-    # Fix calendar
-    calendar.schedule['market_open'] = calendar.schedule.market_open.dt.tz_localize('UTC')
-    calendar.schedule['market_close'] = calendar.schedule.market_close.dt.tz_localize('UTC')
+        ])
+    meta_arr['start_date'] = np.datetime64('NaT')
+    meta_arr['end_date'] = np.datetime64('NaT')
+    meta_arr['auto_close_date'] = np.datetime64('NaT')
 
     def _minute_iter(path):
         """ Yields (sid, dataframe) for ingesting, while updating
@@ -89,36 +237,43 @@ def ingest(environ,
         ----
         sid is index of insturment folder in the path. No special meaning.
         """
-        instruments = os.listdir(path)  # get ["EURSD", "AUDUSD"]
-        for index, name in enumerate(instruments):
-            metadata.ix[index] = None, None, None, 'NYSE', name, name
-            current_dir = os.path.join(path, name)
-
-            zips = filter(lambda x: ".zip" in x, os.listdir(current_dir))
-            for z in zips:
-                zfile = zipfile.ZipFile(os.path.join(current_dir, z), 'r')
-                zfile.extractall(current_dir)
-
-            # ensure data is ingested chronologically
-            sorted_csv_name = sorted(os.listdir(current_dir), key=lambda x: (int(re.sub('\D', '', x)), x))
+        # `instruments` is closed over from ingest; re-listing the
+        # folder here could disagree with the metadata row order
 
-            csvs = filter(lambda x: ".csv" in x, sorted_csv_name)
+        # instruments are independent files and dataframes, so parse
+        # them in worker processes and feed the writer as they finish
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+            futures = [pool.submit(_load_instrument,
+                                   index, name, os.path.join(path, name))
+                       for index, name in enumerate(instruments)]
             with maybe_show_progress(
-                    csvs,
+                    futures,
                     show_progress,
-                    label='Ingesting csv stream for %s: ' % name):
-                for minute_csv in csvs:
-                    ohlc = resample.bid_ask_to_ohlc(os.path.join(current_dir, minute_csv))
+                    label='Ingesting csv stream: '):
+                for future in as_completed(futures):
+                    index, chunks, start_ts, end_ts = future.result()
+                    name = instruments[index]
 
                     # Keep metadata updated
-                    if metadata.ix[index, "start_date"] is pd.NaT or metadata.start_date.ix[index] > ohlc.index[0]:
-                        metadata.ix[index, "start_date"] = ohlc.index[0]
-                    if metadata.ix[index, "end_date"] is pd.NaT or metadata.end_date.ix[index] < ohlc.index[-1]:
-                        metadata.ix[index, "end_date"] = ohlc.index[-1]
-                        metadata.ix[index, "auto_close_date"] = ohlc.index[-1] + pd.Timedelta(days=1)
-                    yield index, ohlc
-
-    minute_bar_writer.write(_minute_iter(path), show_progress)
+                    meta_arr['exchange'][index] = 'NYSE'
+                    meta_arr['symbol'][index] = name
+                    meta_arr['asset_name'][index] = name
+                    if start_ts is not None:
+                        meta_arr['start_date'][index] = start_ts.value
+                        meta_arr['end_date'][index] = end_ts.value
+                        meta_arr['auto_close_date'][index] = \
+                            (end_ts + pd.Timedelta(days=1)).value
+
+                    for ohlc in chunks:
+                        yield index, ohlc
+
+    # double-buffer: parse the next chunks while the writer flushes
+    minute_bar_writer.write(prefetch(_minute_iter(path)), show_progress)
+
+    metadata = pd.DataFrame(meta_arr)
+    metadata['start_date'] = metadata.start_date.dt.tz_localize('UTC')
+    metadata['end_date'] = metadata.end_date.dt.tz_localize('UTC')
+    metadata['auto_close_date'] = metadata.auto_close_date.dt.tz_localize('UTC')
     asset_db_writer.write(equities=metadata)
 
     adjustment_writer.write()
@@ -8,7 +8,7 @@ import pytz
 import pandas as pd
 from ..zipline_extension.calendars.exchange_calendar_forex import ForexCalendar
 from zipline.data.bundles import register, ingest
-from zipline.utils.calendars import register_calendar
+from zipline.utils.calendar_utils import register_calendar
 
 
 @pytest.mark.skip("need to download csv data zip from truefx and put into fixtures/stream")
@@ -38,7 +38,7 @@ def test_df_iloc():
         'symbol': ['test']
         })
     assert metadata.iloc[0]["start_date"] < metadata.iloc[0]["end_date"]
-    metadata.ix[0, "start_date"] = datetime.today() + timedelta(days=3)
+    metadata.loc[0, "start_date"] = datetime.today() + timedelta(days=3)
     assert metadata.iloc[0]["start_date"] > metadata.iloc[0]["end_date"]
 
 
@@ -6,11 +6,70 @@ TODO: Benchmark latency
 import pytest
 import os
 import json
+import types
+import asyncio
+from decimal import Decimal
+import aiohttp
 import oandapy
+import requests
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 import logging
 
 
+_session = None
+_session_loop = None
+_loop = None
+
+
+def _http_session():
+    """
+    Lazily created, module level aiohttp session so that every
+    Oanda instance shares one keep-alive connection pool and the
+    TLS handshake is paid once, not per order.
+
+    The session is bound to the loop that created it, so the owning
+    loop is recorded and the session rebuilt whenever it is closed or
+    the caller is running on a different loop -- e.g. each asyncio.run
+    of create_order_async gets a fresh loop, and reusing the previous
+    run's session would fail on its dead loop.
+    """
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=75))
+        _session_loop = loop
+    return _session
+
+
+if orjson is not None:
+    # oandapy parses every payload with its module-level json.loads --
+    # it never calls response.json() -- so candle and position
+    # responses only reach orjson by swapping that reference. dumps
+    # stays stdlib: orjson returns bytes, which requests' param
+    # encoding does not expect.
+    oandapy.oandapy.json = types.SimpleNamespace(loads=orjson.loads,
+                                                 dumps=json.dumps)
+
+
+def _event_loop():
+    """
+    Private loop for the sync facades. asyncio.run would tear down
+    the shared session after every call, so we keep our own.
+    """
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+    return _loop
+
+
 class Oanda(oandapy.oandapy.API):
     PRECISION = {'EUR_USD': '%.5f',
                  'USD_JPY': '%.3f',
@@ -18,6 +77,11 @@ class Oanda(oandapy.oandapy.API):
                  'AUD_USD': '%.5f',
                  'GBP_USD': '%.5f'}
 
+    # Set once a batch probe answers 404/405. Oanda v1 environments
+    # have no /orders/batch, so without this every batch would pay an
+    # extra round trip rediscovering that.
+    _batch_unsupported = False
+
     def __init__(self, id):
         self.id = id
         super(Oanda, self).__init__(environment=os.getenv("OANDA_ENV", "practice"),
@@ -26,6 +90,25 @@ class Oanda(oandapy.oandapy.API):
         self.oanda = oandapy.API(environment=os.getenv("OANDA_ENV", "practice"),
                                  access_token=os.getenv("OANDA_ACCESS_TOKEN", "xxx"))
 
+        # Keep-alive pool for the oandapy-backed calls, so back-to-back
+        # REST calls reuse one TLS session instead of handshaking each time.
+        adapter = HTTPAdapter(pool_connections=16,
+                              pool_maxsize=32,
+                              max_retries=Retry(total=3, backoff_factor=0.1))
+        for client in (self.client, self.oanda.client):
+            client.mount("https://", adapter)
+
+    def close(self):
+        """ Releases the pooled keep-alive connections. """
+        self.client.close()
+        self.oanda.client.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
     def get_account(self):
         params = {"account_id": self.id}
         response = self.oanda.get_account(**params)
@@ -36,73 +119,165 @@ class Oanda(oandapy.oandapy.API):
                      price=None, lower_bound=None, upper_bound=None, expiry=None,
                      stop_loss=None, take_profit=None, trailling=None):
         """
-        Creates an order with Oanda rest api.
-
-        Default expiry is 1 month from now, for limit, stop
-        and marketIfTouch order types.
+        Sync facade over create_order_async, for legacy callers.
 
         Return
         ------
         order_id: string
             Oanda order id string
         """
+        return _event_loop().run_until_complete(
+            self.create_order_async(instrument, amount,
+                                    order_type=order_type,
+                                    price=price,
+                                    lower_bound=lower_bound,
+                                    upper_bound=upper_bound,
+                                    expiry=expiry,
+                                    stop_loss=stop_loss,
+                                    take_profit=take_profit,
+                                    trailling=trailling))
 
-        if amount < 0:
-            side = "sell"
-        else:
-            side = "buy"
+    def create_orders(self, specs):
+        """
+        Submits many orders concurrently, so N orders cost roughly
+        one round trip instead of N.
 
-        instrument_string = ""
-        if type(instrument) is str:
-            instrument_string = instrument
-        else:
-            instrument_string = instrument.symbol
-        params = {"account_id": self.id,
-                  "instrument": instrument_string,
-                  "units":      abs(amount),
-                  "side":       side,
-                  "type":       order_type}
+        Parameters
+        ----------
+        specs : list of dict
+            Each dict holds keyword arguments for create_order.
 
+        Return
+        ------
+        order_ids: list
+            One entry per spec, in the same order.
+        """
+        return _event_loop().run_until_complete(self.create_orders_async(specs))
 
-        if expiry is not None:
-            if type(expiry) is str:
-                expiry_string = expiry
-            else:
-                expiry_string = expiry.strftime("%Y-%m-%dT%H:%M:%S")
-            params["expiry"] = expiry_string
+    async def create_orders_async(self, specs):
+        """
+        Packs all order specs into one POST against the batch orders
+        endpoint, amortizing the round trip and rate-limit budget over
+        the whole batch. Falls back to concurrent single-order
+        submission only when the batch was provably not taken -- the
+        environment has no batch endpoint (404/405, remembered so
+        later batches skip the probe) or the connection was never
+        established. Any other error is logged and surfaced as None
+        instead, since the server may have received the batch and
+        resubmitting could fill orders twice.
+        """
+        if not Oanda._batch_unsupported:
+            orders = [self._build_params(**spec) for spec in specs]
+            url = "%s/v1/accounts/%s/orders/batch" % (self.oanda.api_url,
+                                                      self.id)
+            headers = {"Authorization": "Bearer %s" % self.access_token}
+            try:
+                session = _http_session()
+                async with session.post(url, json={"orders": orders},
+                                        headers=headers) as resp:
+                    if resp.status in (404, 405):
+                        Oanda._batch_unsupported = True
+                        logging.info("#create_orders no batch endpoint "
+                                     "(status=%s), submitting individually"
+                                     % resp.status)
+                    else:
+                        resp.raise_for_status()
+                        response = await resp.json()
+                        logging.info("#create_orders orders=%s response=%s" % (orders, response))
+                        return [self._order_id(r) for r in response["orders"]]
+            except aiohttp.ClientResponseError as e:
+                logging.exception(e)
+                return None
+            except aiohttp.ClientConnectorError as e:
+                logging.info("#create_orders batch request not delivered "
+                             "(%s), submitting individually" % e)
+            except aiohttp.ClientError as e:
+                # disconnects after the connection was up may have
+                # delivered the batch; don't risk a double submission
+                logging.exception(e)
+                return None
+        return await asyncio.gather(
+            *[self.create_order_async(**spec) for spec in specs])
+
+    def _build_params(self, instrument, amount, order_type='market',
+                      price=None, lower_bound=None, upper_bound=None,
+                      expiry=None, stop_loss=None, take_profit=None,
+                      trailling=None):
+        """
+        Builds the request params dict shared by the single and batch
+        order endpoints.
+
+        Default expiry is 1 month from now, for limit, stop
+        and marketIfTouch order types.
+        """
 
-        precision = Oanda.PRECISION[instrument_string]
-        if price and order_type != 'market':
-            params["price"] = precision % price
+        side = "sell" if amount < 0 else "buy"
 
-        if lower_bound:
-            params["lowerBound"] = precision % lower_bound
+        if type(instrument) is str:
+            instrument_string = instrument
+        else:
+            instrument_string = instrument.symbol
 
-        if upper_bound:
-            params["upperBound"] = precision % upper_bound
+        if expiry is None or type(expiry) is str:
+            expiry_string = expiry
+        else:
+            expiry_string = expiry.strftime("%Y-%m-%dT%H:%M:%S")
 
-        if stop_loss:
-            params["stopLoss"] = precision % stop_loss
+        digits = Oanda._PRECISION_DIGITS.get(instrument_string, 5)
 
-        if take_profit:
-            params["takeProfit"] = precision % take_profit
+        # one straight-line pass; absent fields come out as None and
+        # are filtered, instead of a branch per optional field
+        return {k: v for k, v in (
+            ("instrument",   instrument_string),
+            ("units",        str(abs(amount))),
+            ("side",         side),
+            ("type",         order_type),
+            ("expiry",       expiry_string),
+            ("price",        f"{price:.{digits}f}"
+                             if price and order_type != 'market' else None),
+            ("lowerBound",   f"{lower_bound:.{digits}f}" if lower_bound else None),
+            ("upperBound",   f"{upper_bound:.{digits}f}" if upper_bound else None),
+            ("stopLoss",     f"{stop_loss:.{digits}f}" if stop_loss else None),
+            ("takeProfit",   f"{take_profit:.{digits}f}" if take_profit else None),
+            ("trailingStop", str(trailling) if trailling else None),
+        ) if v is not None}
 
-        if trailling:
-            params["trailingStop"] = trailling
+    async def create_order_async(self, instrument, amount, **kwargs):
+        """
+        Creates an order with Oanda rest api, without blocking the
+        event loop while the request is in flight. The common
+        create-order + attach-SL/TP pattern can therefore overlap
+        its round trips.
 
+        Return
+        ------
+        order_id: string
+            Oanda order id string
+        """
+        params = self._build_params(instrument, amount, **kwargs)
+        url = "%s/v1/accounts/%s/orders" % (self.oanda.api_url, self.id)
+        headers = {"Authorization": "Bearer %s" % self.access_token}
         try:
-            response = self.oanda.create_order(**params)
+            session = _http_session()
+            async with session.post(url, data=params, headers=headers) as resp:
+                # a 4xx rejection would otherwise flow through _order_id
+                # and hand the caller the raw error dict as an "order id"
+                resp.raise_for_status()
+                response = await resp.json()
             logging.info("#create_order params=%s response=%s" % (params, response))
-            if "tradeOpened" in response:
-                return response["tradeOpened"]["id"]
-            elif "orderOpened" in response:
-                return response["orderOpened"]["id"]
-            else:
-                return response
-        except oandapy.exceptions.OandaError as e:
+            return self._order_id(response)
+        except aiohttp.ClientError as e:
             logging.exception(e)
             return None
 
+    @staticmethod
+    def _order_id(response):
+        if "tradeOpened" in response:
+            return response["tradeOpened"]["id"]
+        elif "orderOpened" in response:
+            return response["orderOpened"]["id"]
+        return response
+
     def close_position(self, instrument):
         try:
             response = self.oanda.close_position(self.id, instrument)
@@ -133,3 +308,23 @@ class Oanda(oandapy.oandapy.API):
                 raise err
 
 
+
+
+def _load_precision():
+    """
+    Expands PRECISION to every instrument Oanda serves, from the pip
+    sizes bundled in oanda_instruments.json, and derives the decimal
+    digit counts _build_params formats with. Price precision is one
+    digit finer than the pip. Loaded once at import; unknown symbols
+    still fall back to 5 digits rather than raising KeyError.
+    """
+    dir_path = os.path.dirname(os.path.realpath(__file__))
+    with open(os.path.join(dir_path, 'oanda_instruments.json')) as data_file:
+        for i in json.load(data_file):
+            digits = 1 - Decimal(i['pip']).normalize().as_tuple().exponent
+            Oanda.PRECISION.setdefault(i['instrument'], "%%.%df" % digits)
+    Oanda._PRECISION_DIGITS = {sym: int(prec[2:-1])
+                               for sym, prec in Oanda.PRECISION.items()}
+
+
+_load_precision()
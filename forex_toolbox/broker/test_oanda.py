@@ -1,20 +1,26 @@
 import requests_mock
 import pytest
 import os
+from unittest import mock
+from aioresponses import aioresponses
+from yarl import URL
 from .oanda import Oanda
-from zipline.assets import Asset
+from zipline.assets import Asset, ExchangeInfo
 
 
 @pytest.fixture
 def broker(request):
     id = os.getenv("OANDA_ACCOUNT_ID", "test")
+    # batch-endpoint discovery is remembered class-wide; tests must
+    # not inherit another test's probe result
+    Oanda._batch_unsupported = False
     return Oanda(id)
 
 
 @pytest.fixture
 def asset(request):
-    return Asset(1, "forex", symbol="EUR_USD",
-                 asset_name="EUR_USD")
+    return Asset(1, ExchangeInfo('forex', 'forex', '??'),
+                 symbol="EUR_USD", asset_name="EUR_USD")
 
 
 def test_get_positions(broker):
@@ -57,44 +63,123 @@ def order_response():
             "tradeReduced": {}}
 
 
+def order_url(broker):
+    return "https://api-fxpractice.oanda.com/v1/accounts/{0}/orders".format(broker.id)
+
+
+def batch_url(broker):
+    return order_url(broker) + "/batch"
+
+
+def sent_params(m, url):
+    requests = m.requests[('POST', URL(url))]
+    return requests[0].kwargs['data']
+
+
 def test_create_order_sell_market(broker, asset):
-    with requests_mock.mock() as m:
-        m.post("https://api-fxpractice.oanda.com/v1/accounts/{0}/orders".format(broker.id),
-               json=order_response())
+    with aioresponses() as m:
+        m.post(order_url(broker), payload=order_response())
 
         order_id = broker.create_order(asset, -2)
         assert order_id == 175517237
 
-        call = m.request_history
-        expected_params = ['instrument=EUR_USD', 'side=sell', 'type=market', 'units=2']
-        assert set(call[0].text.split("&")) == set(expected_params)
+        expected_params = {'instrument': 'EUR_USD', 'side': 'sell',
+                           'type': 'market', 'units': '2'}
+        assert sent_params(m, order_url(broker)) == expected_params
 
 
 def test_create_order_sell_tp_sl(broker, asset):
-    with requests_mock.mock() as m:
-        m.post("https://api-fxpractice.oanda.com/v1/accounts/{0}/orders".format(broker.id),
-               json=order_response())
+    with aioresponses() as m:
+        m.post(order_url(broker), payload=order_response())
 
         order_id = broker.create_order(asset, -2, trailling=10.5, stop_loss=1.2345, take_profit=2.3456)
         assert order_id == 175517237
 
-        call = m.request_history
-        expected_params = ['instrument=EUR_USD', 'side=sell',
-                           'type=market', 'units=2',
-                           'trailingStop=10.5',
-                           'takeProfit=2.34560', 'stopLoss=1.23450']
-        assert set(call[0].text.split("&")) == set(expected_params)
+        expected_params = {'instrument': 'EUR_USD', 'side': 'sell',
+                           'type': 'market', 'units': '2',
+                           'trailingStop': '10.5',
+                           'takeProfit': '2.34560', 'stopLoss': '1.23450'}
+        assert sent_params(m, order_url(broker)) == expected_params
 
 def test_create_order_stop(broker, asset):
-    with requests_mock.mock() as m:
-        m.post("https://api-fxpractice.oanda.com/v1/accounts/{0}/orders".format(broker.id),
-               json=order_response())
+    with aioresponses() as m:
+        m.post(order_url(broker), payload=order_response())
 
         order_id = broker.create_order(asset, -2, price=2.3456, order_type='stop')
         assert order_id == 175517237
 
-        call = m.request_history
-        expected_params = ['instrument=EUR_USD', 'side=sell',
-                           'type=stop', 'units=2',
-                           'price=2.34560']
-        assert set(call[0].text.split("&")) == set(expected_params)
+        expected_params = {'instrument': 'EUR_USD', 'side': 'sell',
+                           'type': 'stop', 'units': '2',
+                           'price': '2.34560'}
+        assert sent_params(m, order_url(broker)) == expected_params
+
+
+def test_create_orders_batch(broker, asset):
+    with aioresponses() as m:
+        m.post(batch_url(broker),
+               payload={"orders": [order_response(), order_response()]})
+
+        order_ids = broker.create_orders([
+            {'instrument': asset, 'amount': -2},
+            {'instrument': asset, 'amount': 3, 'take_profit': 2.3456},
+        ])
+        assert order_ids == [175517237, 175517237]
+        assert not Oanda._batch_unsupported
+
+
+def test_create_orders_batch_rejected(broker, asset):
+    # a 400 means the server saw the batch; resubmitting could fill
+    # orders twice, so the call surfaces None instead of falling back
+    with aioresponses() as m:
+        m.post(batch_url(broker), status=400)
+
+        order_ids = broker.create_orders([
+            {'instrument': asset, 'amount': -2},
+        ])
+        assert order_ids is None
+        assert not Oanda._batch_unsupported
+
+
+def test_create_orders_concurrent(broker, asset):
+    with aioresponses() as m:
+        m.post(batch_url(broker), status=404)
+        m.post(order_url(broker), payload=order_response())
+        m.post(order_url(broker), payload=order_response())
+
+        order_ids = broker.create_orders([
+            {'instrument': asset, 'amount': -2},
+            {'instrument': asset, 'amount': 3, 'take_profit': 2.3456},
+        ])
+        assert order_ids == [175517237, 175517237]
+        assert Oanda._batch_unsupported
+
+        # no 404 registered this time: the remembered discovery skips
+        # the batch probe and goes straight to individual submission
+        m.post(order_url(broker), payload=order_response())
+        m.post(order_url(broker), payload=order_response())
+
+        order_ids = broker.create_orders([
+            {'instrument': asset, 'amount': -2},
+            {'instrument': asset, 'amount': 3},
+        ])
+        assert order_ids == [175517237, 175517237]
+
+
+def test_orjson_on_oandapy_parse_path(broker):
+    orjson = pytest.importorskip("orjson")
+    import oandapy
+
+    # oandapy parses with its module-level json.loads; the orjson swap
+    # only counts if that reference now points at orjson
+    assert oandapy.oandapy.json.loads is orjson.loads
+
+    url = "https://api-fxpractice.oanda.com/v1/accounts/{0}/positions" \
+        .format(broker.id)
+    with requests_mock.mock() as m:
+        m.get(url, content=b'{"positions": []}')
+        with mock.patch.object(oandapy.oandapy.json, 'loads',
+                               side_effect=orjson.loads) as loads:
+            positions = broker.get_positions(broker.id)
+
+    assert loads.called
+    assert positions == {"positions": []}
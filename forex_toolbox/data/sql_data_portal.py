@@ -4,7 +4,7 @@ import numpy as np
 
 from .. import utils
 
-from zipline.utils.calendars import get_calendar
+from zipline.utils.calendar_utils import get_calendar
 from zipline.data.data_portal import DataPortal
 from zipline.data.history_loader import MinuteHistoryLoader
 
@@ -18,7 +18,7 @@ from sqlalchemy import (
     String
 )
 
-from zipline.data.minute_bars import MinuteBarReader
+from zipline.data.bcolz_minute_bars import MinuteBarReader
 
 
 OHLCVP_FIELDS = frozenset([
@@ -58,18 +58,24 @@ class SqlMinuteReader(MinuteBarReader):
         echo = os.environ.get("SQL_ECHO", False) == 'true'
         self.engine = create_engine(db_url,
                                     echo=echo)
-        self.trading_calendar = trading_calendar or get_calendar("NYSE")
+        self._trading_calendar = trading_calendar or get_calendar("NYSE")
+
+    @property
+    def trading_calendar(self):
+        # MinuteBarReader declares this abstract; a plain instance
+        # attribute would leave the class uninstantiable
+        return self._trading_calendar
 
     def load_data_cache(self, sids, start=None, end=None):
         self._cache = {}
         if start is None:
-            start = self.trading_calendar.opens()[0]  # Pending PR to remove method call
+            start = self.trading_calendar.opens.iloc[0]
         if end is None:
-            end = self.trading_calendar.closes[1]
+            end = self.trading_calendar.closes.iloc[1]
         for s in sids:
             symbol = utils.symbol(s)
             s_table = table(symbol)
-            query = select([s_table]) \
+            query = select(s_table) \
                         .where(
                             and_(
                                 s_table.c.datetime >= start,
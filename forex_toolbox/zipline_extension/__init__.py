@@ -1,4 +1,3 @@
 from .bracket_blotter import BracketBlotter
 from .extension import *
-from .finance.trading import BernoullioTradingEnvironment
 from .assets.assets import AssetFinder
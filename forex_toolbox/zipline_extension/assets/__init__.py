@@ -5,7 +5,6 @@ from zipline.assets import (
         Asset,
         Equity,
         Future,
-        make_asset_array,
-        CACHE_FILE_TEMPLATE
+        make_asset_array
 )
 
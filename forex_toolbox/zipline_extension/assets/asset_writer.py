@@ -15,7 +15,7 @@
 from collections import namedtuple
 import re
 
-from contextlib2 import ExitStack
+from contextlib import ExitStack
 import numpy as np
 import pandas as pd
 import sqlalchemy as sa
@@ -29,7 +29,7 @@ from zipline.assets.asset_db_schema import (
     equities as equities_table,
     equity_symbol_mappings,
     futures_contracts as futures_contracts_table,
-    futures_exchanges,
+    exchanges as futures_exchanges,
     futures_root_symbols,
     metadata,
     version_info,
@@ -250,7 +250,7 @@ def _split_symbol_mappings(df):
                     for symbol, (intersections, df) in sorted(
                         ambigious.items(),
                         key=first,
-                    ),
+                    )
                 ),
             )
         )
@@ -40,10 +40,10 @@ from toolz.curried import operator as op
 from zipline.errors import (
     EquitiesNotFound,
     FutureContractsNotFound,
-    MapAssetIdentifierIndexError,
     MultipleSymbolsFound,
     SidsNotFound,
     SymbolNotFound,
+    ZiplineError,
 )
 from zipline.assets import (
     Asset, Equity, Future,
@@ -58,7 +58,6 @@ from zipline.assets.asset_writer import (
 from zipline.assets import (
     ASSET_DB_VERSION
 )
-from zipline.utils.control_flow import invert
 from zipline.utils.memoize import lazyval, weak_lru_cache
 from zipline.utils.numpy_utils import as_column
 from zipline.utils.preprocess import preprocess
@@ -87,6 +86,32 @@ _asset_timestamp_fields = frozenset({
 SymbolOwnership = namedtuple('SymbolOwnership', 'start end sid symbol')
 
 
+class MapAssetIdentifierIndexError(ZiplineError):
+    """
+    Raised when AssetMetaData.map_identifier_index_to_sids() is called on an
+    index of invalid objects. Inlined from zipline 1.0's ``zipline.errors``,
+    which newer zipline no longer ships.
+    """
+    msg = """
+AssetFinder can not map an index with values of type {obj}. Asset indices of
+DataFrames or Panels must be integer sids, string symbols, or Asset objects.
+""".strip()
+
+
+def invert(d):
+    """Invert a dictionary into a dictionary of sets, mapping each value
+    to the set of keys that held it. Inlined from zipline 1.0's
+    ``zipline.utils.control_flow``, which newer zipline no longer ships.
+    """
+    out = {}
+    for k, v in iteritems(d):
+        try:
+            out[v].add(k)
+        except KeyError:
+            out[v] = {k}
+    return out
+
+
 @curry
 def _filter_kwargs(names, dict_):
     """Filter out kwargs from a dictionary.
@@ -432,13 +457,13 @@ class AssetFinder(object):
 
     @staticmethod
     def _select_assets_by_sid(asset_tbl, sids):
-        return sa.select([asset_tbl]).where(
+        return sa.select(asset_tbl).where(
             asset_tbl.c.sid.in_(map(int, sids))
         )
 
     @staticmethod
     def _select_asset_by_symbol(asset_tbl, symbol):
-        return sa.select([asset_tbl]).where(asset_tbl.c.symbol == symbol)
+        return sa.select(asset_tbl).where(asset_tbl.c.symbol == symbol)
 
     def _select_most_recent_symbols_chunk(self, sid_group):
         """Retrieve the most recent symbol for a set of sids.
@@ -492,7 +517,7 @@ class AssetFinder(object):
                 for sid_group in partition_all(
                     SQLITE_MAX_VARIABLE_NUMBER,
                     sids
-                ),
+                )
             )
         }
 
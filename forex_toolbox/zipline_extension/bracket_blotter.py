@@ -16,7 +16,7 @@
 # limitations under the License.
 from logbook import Logger
 
-from zipline.finance.blotter import Blotter
+from zipline.finance.blotter import SimulationBlotter
 
 from .bracket_order import BracketOrder
 from collections import defaultdict
@@ -25,11 +25,13 @@ log = Logger('Blotter')
 warning_logger = Logger('AlgoWarning')
 
 
-class BracketBlotter(Blotter):
-    def __init__(self, data_frequency, asset_finder, slippage_func=None,
-                 commission=None, cancel_policy=None):
-        Blotter.__init__(self, data_frequency, asset_finder, slippage_func,
-                         commission, cancel_policy)
+class BracketBlotter(SimulationBlotter):
+    def __init__(self, equity_slippage=None, future_slippage=None,
+                 equity_commission=None, future_commission=None,
+                 cancel_policy=None):
+        SimulationBlotter.__init__(self, equity_slippage, future_slippage,
+                                   equity_commission, future_commission,
+                                   cancel_policy)
         self.profit_orders = defaultdict(list)
         self.loss_orders = defaultdict(list)
 
@@ -120,8 +122,8 @@ class BracketBlotter(Blotter):
 
         commissions_list: List
             commissions_list: list of commissions resulting from filling the
-            open orders.  A commission is an object with "sid" and "cost"
-            parameters.
+            open orders.  A commission is an object with "asset" and
+            "cost" parameters.
 
         closed_orders: List
             closed_orders: list of all the orders that have filled.
@@ -131,20 +133,18 @@ class BracketBlotter(Blotter):
         commissions = []
 
         if self.open_orders:
-            assets = self.asset_finder.retrieve_all(self.open_orders)
-            asset_dict = {asset.sid: asset for asset in assets}
+            for asset, asset_orders in self.open_orders.items():
+                slippage = self.slippage_models[type(asset)]
 
-            for sid, asset_orders in self.open_orders.items():
-                asset = asset_dict[sid]
-
-                for order, txn in \
-                        self.slippage_func(bar_data, asset, asset_orders):
+                for order, txn in slippage.simulate(bar_data, asset,
+                                                    asset_orders):
+                    commission = self.commission_models[type(asset)]
                     additional_commission = \
-                        self.commission.calculate(order, txn)
+                        commission.calculate(order, txn)
 
                     if additional_commission > 0:
                         commissions.append({
-                            "sid": order.sid,
+                            "asset": order.asset,
                             "order": order,
                             "cost": additional_commission
                         })
@@ -1,72 +1,34 @@
-import pytest
 import pytz
-import pandas as pd
 from datetime import time
-from zipline.utils.calendars import TradingCalendar
-from zipline.utils.memoize import lazyval
+from zipline.utils.calendar_utils import TradingCalendar
 
 
 class ForexCalendar(TradingCalendar):
+    """
+    Around-the-clock forex calendar: sessions run Sunday through Friday,
+    opening late on Sundays (New York 6pm) and closing early on Fridays
+    (New York 4pm).
+    """
 
     NYT_4PM = time(20)
     NYT_6PM = time(22)
 
-    @lazyval
-    def day(self):
-        return pd.tseries.offsets.CustomBusinessDay(
-            holidays=self.adhoc_holidays,
-            calendar=self.regular_holidays,
-            weekmask='Sun Mon Tue Wed Thu Fri'
-        )
+    name = "forex"
+    tz = pytz.UTC
 
-    @property
-    def name(self):
-        return "forex"
+    open_times = ((None, time(0, 0)),)
+    close_times = ((None, time(23, 59)),)
 
     @property
-    def tz(self):
-        return pytz.UTC
+    def weekmask(self):
+        return "Sun Mon Tue Wed Thu Fri"
 
     @property
-    def open_time(self):
-        return time(0, 0)
+    def special_opens(self):
+        # market opens with New York's Sunday evening session
+        return [(self.NYT_6PM, 6)]
 
     @property
-    def close_time(self):
-        return time(23, 59)
-
-    def _calculate_special_opens(self, start, end):
-        return self._special_dates(
-            self.special_opens,
-            self.special_opens_adhoc(start, end),
-            start,
-            end,
-        )
-
-    def _calculate_special_closes(self, start, end):
-        return self._special_dates(
-            self.special_closes,
-            self.special_closes_adhoc(start, end),
-            start,
-            end,
-        )
-
-    def special_opens_adhoc(self, start, end):
-        return [
-            (self.NYT_6PM, self._sunday_dates(start, end))
-        ]
-
-    def special_closes_adhoc(self, start, end):
-        return [
-            (self.NYT_4PM, self._friday_dates(start, end))
-        ]
-
-    def _friday_dates(self, start, end):
-        return pd.date_range(start=start,
-                             end=end,
-                             freq='W-FRI')
-
-    def _sunday_dates(self, start, end):
-        return pd.date_range(start=start,
-                             end=end,
-                             freq='W-SUN')
+    def special_closes(self):
+        # and closes with New York's Friday afternoon session
+        return [(self.NYT_4PM, 4)]
@@ -1,7 +1,7 @@
 import os
 from .. import bid_ask_stream
 from zipline.data.bundles import register
-from zipline.utils.calendars import register_calendar
+from zipline.utils.calendar_utils import register_calendar
 from .calendars.exchange_calendar_forex import ForexCalendar
 import pandas as pd
 
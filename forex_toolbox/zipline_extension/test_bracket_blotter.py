@@ -14,12 +14,15 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from nose_parameterized import parameterized
+from parameterized import parameterized
+
+import copy
+from collections import defaultdict
 
 import pandas as pd
 import pytest
 
-from zipline.finance.blotter import Blotter
+from zipline.finance.blotter import SimulationBlotter
 from zipline.finance.order import ORDER_STATUS, Order
 from zipline.finance.execution import (
     LimitOrder,
@@ -31,13 +34,15 @@ from zipline.finance.execution import (
 from zipline.gens.sim_engine import SESSION_END, BAR
 from zipline.finance.cancel_policy import EODCancel, NeverCancel
 from zipline.finance.slippage import (
-    DEFAULT_VOLUME_SLIPPAGE_BAR_LIMIT,
+    DEFAULT_EQUITY_VOLUME_SLIPPAGE_BAR_LIMIT,
     FixedSlippage,
+    VolumeShareSlippage,
 )
+from zipline.assets import Equity
+from zipline.finance.asset_restrictions import NoRestrictions
 from zipline.protocol import BarData
 from zipline.testing.fixtures import (
     WithDataPortal,
-    WithLogger,
     WithSimParams,
     ZiplineTestCase,
 )
@@ -47,16 +52,20 @@ from .bracket_blotter import BracketBlotter
 from .execution import BracketedMarketOrder
 
 
-class BlotterTestCase(WithLogger,
-                      WithDataPortal,
+def _const(x):
+    """ One closure cell per dt, instead of a fresh lambda per BarData. """
+    return lambda: x
+
+
+class BlotterTestCase(WithDataPortal,
                       WithSimParams,
                       ZiplineTestCase):
-    START_DATE = pd.Timestamp('2006-01-04', tz='utc')
-    END_DATE = pd.Timestamp('2006-01-06', tz='utc')
+    START_DATE = pd.Timestamp('2006-01-04')
+    END_DATE = pd.Timestamp('2006-01-06')
     ASSET_FINDER_EQUITY_SIDS = 24, 25
 
     @classmethod
-    def make_equity_daily_bar_data(cls):
+    def make_equity_daily_bar_data(cls, country_code, sids):
         yield 24, pd.DataFrame(
             {
                 'open': [50, 50, 51],
@@ -78,6 +87,41 @@ class BlotterTestCase(WithLogger,
             index=cls.sim_params.sessions,
         )
 
+    _blotter_cache = {}
+
+    @classmethod
+    def _template_blotter(cls, policy=None, blotter_cls=SimulationBlotter):
+        """
+        Memoizes one pristine blotter per (class, policy type);
+        __init__ wires up the slippage and commission model tables,
+        which is too heavy to repeat per test. VolumeShareSlippage is
+        passed explicitly because the reloaded default is
+        FixedBasisPointsSlippage, and the fill-size assertions here
+        are written against the volume-share limit.
+        """
+        key = (blotter_cls, type(policy))
+        template = cls._blotter_cache.get(key)
+        if template is None:
+            template = blotter_cls(equity_slippage=VolumeShareSlippage(),
+                                   cancel_policy=policy)
+            cls._blotter_cache[key] = template
+        return template
+
+    def _fresh_blotter(self, policy=None, blotter_cls=SimulationBlotter):
+        """
+        Shallow-copies the cached template and resets its mutable
+        containers, handing each test an empty, independent blotter.
+        """
+        blotter = copy.copy(self._template_blotter(policy, blotter_cls))
+        blotter.open_orders = defaultdict(list)
+        blotter.orders = {}
+        blotter.new_orders = []
+        blotter.current_dt = None
+        if isinstance(blotter, BracketBlotter):
+            blotter.profit_orders = defaultdict(list)
+            blotter.loss_orders = defaultdict(list)
+        return blotter
+
     @parameterized.expand([(MarketOrder(), None, None),
                            (LimitOrder(10), 10, None),
                            (StopOrder(10), None, 10),
@@ -86,20 +130,35 @@ class BlotterTestCase(WithLogger,
                                  expected_lmt,
                                  expected_stp):
 
-        blotter = Blotter('daily', self.env.asset_finder)
+        blotter = self._fresh_blotter()
 
-        asset_24 = blotter.asset_finder.retrieve_asset(24)
+        asset_24 = self.asset_finder.retrieve_asset(24)
         blotter.order(asset_24, 100, style_obj)
         result = blotter.open_orders[asset_24][0]
 
         self.assertEqual(result.limit, expected_lmt)
         self.assertEqual(result.stop, expected_stp)
 
+    def _assert_open_orders(self, blotter, asset, expected):
+        """
+        Probes the asset's open orders in place instead of
+        materializing amount and id lists just to compare them.
+
+        expected : list of (amount, order_id) tuples; pass None as the
+        order_id to skip the id check for that slot.
+        """
+        open_orders = blotter.open_orders[asset]
+        self.assertEqual(len(open_orders), len(expected))
+        for order, (amount, order_id) in zip(open_orders, expected):
+            self.assertEqual(order.amount, amount)
+            if order_id is not None:
+                self.assertEqual(order.id, order_id)
+
     def test_cancel(self):
-        blotter = Blotter('daily', self.env.asset_finder)
+        blotter = self._fresh_blotter()
 
-        asset_24 = blotter.asset_finder.retrieve_asset(24)
-        asset_25 = blotter.asset_finder.retrieve_asset(25)
+        asset_24 = self.asset_finder.retrieve_asset(24)
+        asset_25 = self.asset_finder.retrieve_asset(25)
 
         oid_1 = blotter.order(asset_24, 100, MarketOrder())
         oid_2 = blotter.order(asset_24, 200, MarketOrder())
@@ -110,32 +169,21 @@ class BlotterTestCase(WithLogger,
         blotter.order(asset_25, 150, MarketOrder())
 
         self.assertEqual(len(blotter.open_orders), 2)
-        self.assertEqual(len(blotter.open_orders[asset_24]), 3)
-        self.assertEqual(
-            [o.amount for o in blotter.open_orders[asset_24]],
-            [100, 200, 300],
-        )
+        self._assert_open_orders(blotter, asset_24,
+                                 [(100, oid_1), (200, oid_2), (300, oid_3)])
 
         blotter.cancel(oid_2)
         self.assertEqual(len(blotter.open_orders), 2)
-        self.assertEqual(len(blotter.open_orders[asset_24]), 2)
-        self.assertEqual(
-            [o.amount for o in blotter.open_orders[asset_24]],
-            [100, 300],
-        )
-        self.assertEqual(
-            [o.id for o in blotter.open_orders[asset_24]],
-            [oid_1, oid_3],
-        )
+        self._assert_open_orders(blotter, asset_24,
+                                 [(100, oid_1), (300, oid_3)])
 
         blotter.cancel_all_orders_for_asset(asset_24)
         self.assertEqual(len(blotter.open_orders), 1)
         self.assertEqual(list(blotter.open_orders), [asset_25])
 
     def test_blotter_eod_cancellation(self):
-        blotter = Blotter('minute', self.env.asset_finder,
-                          cancel_policy=EODCancel())
-        asset_24 = blotter.asset_finder.retrieve_asset(24)
+        blotter = self._fresh_blotter(EODCancel())
+        asset_24 = self.asset_finder.retrieve_asset(24)
 
         # Make two orders for the same sid, so we can test that we are not
         # mutating the orders list as we are cancelling orders
@@ -158,10 +206,9 @@ class BlotterTestCase(WithLogger,
             self.assertEqual(order.status, ORDER_STATUS.CANCELLED)
 
     def test_blotter_never_cancel(self):
-        blotter = Blotter('minute', self.env.asset_finder,
-                          cancel_policy=NeverCancel())
+        blotter = self._fresh_blotter(NeverCancel())
 
-        blotter.order(blotter.asset_finder.retrieve_asset(24), 100,
+        blotter.order(self.asset_finder.retrieve_asset(24), 100,
                       MarketOrder())
 
         self.assertEqual(len(blotter.new_orders), 1)
@@ -174,9 +221,8 @@ class BlotterTestCase(WithLogger,
         self.assertEqual(blotter.new_orders[0].status, ORDER_STATUS.OPEN)
 
     def test_order_rejection(self):
-        blotter = Blotter(self.sim_params.data_frequency,
-                          self.env.asset_finder)
-        asset_24 = blotter.asset_finder.retrieve_asset(24)
+        blotter = self._fresh_blotter()
+        asset_24 = self.asset_finder.retrieve_asset(24)
 
         # Reject a nonexistent order -> no order appears in new_order,
         # no exceptions raised out
@@ -205,8 +251,7 @@ class BlotterTestCase(WithLogger,
 
         # Do it again, but reject it at a later time (after tradesimulation
         # pulls it from new_orders)
-        blotter = Blotter(self.sim_params.data_frequency,
-                          self.env.asset_finder)
+        blotter = self._fresh_blotter()
         new_open_id = blotter.order(asset_24, 10, MarketOrder())
         new_open_order = blotter.open_orders[asset_24][0]
         self.assertEqual(new_open_id, new_open_order.id)
@@ -222,9 +267,8 @@ class BlotterTestCase(WithLogger,
 
         # You can't reject a filled order.
         # Reset for paranoia
-        blotter = Blotter(self.sim_params.data_frequency,
-                          self.env.asset_finder)
-        blotter.slippage_func = FixedSlippage()
+        blotter = self._fresh_blotter()
+        blotter.slippage_models[Equity] = FixedSlippage()
         filled_id = blotter.order(asset_24, 100, MarketOrder())
         filled_order = None
         blotter.current_dt = self.sim_params.sessions[-1]
@@ -232,7 +276,8 @@ class BlotterTestCase(WithLogger,
             self.data_portal,
             lambda: self.sim_params.sessions[-1],
             self.sim_params.data_frequency,
-            None
+            self.trading_calendar,
+            NoRestrictions(),
         )
         txns, _, closed_orders = blotter.get_transactions(bar_data)
         for txn in txns:
@@ -254,13 +299,12 @@ class BlotterTestCase(WithLogger,
         status indication. When a fill happens, the order should switch
         status to OPEN/FILLED as necessary
         """
-        blotter = Blotter(self.sim_params.data_frequency,
-                          self.env.asset_finder)
+        blotter = self._fresh_blotter()
         # Nothing happens on held of a non-existent order
         blotter.hold(56)
         self.assertEqual(blotter.new_orders, [])
 
-        asset_24 = blotter.asset_finder.retrieve_asset(24)
+        asset_24 = self.asset_finder.retrieve_asset(24)
 
         open_id = blotter.order(asset_24, 100, MarketOrder())
         open_order = blotter.open_orders[asset_24][0]
@@ -280,51 +324,47 @@ class BlotterTestCase(WithLogger,
         self.assertEqual(cancelled_order.id, held_order.id)
         self.assertEqual(cancelled_order.status, ORDER_STATUS.CANCELLED)
 
-        for data in ([100, self.sim_params.sessions[0]],
-                     [400, self.sim_params.sessions[1]]):
-            # Verify that incoming fills will change the order status.
-            trade_amt = data[0]
-            dt = data[1]
-
-            order_size = 100
-            expected_filled = int(trade_amt *
-                                  DEFAULT_VOLUME_SLIPPAGE_BAR_LIMIT)
-            expected_open = order_size - expected_filled
-            expected_status = ORDER_STATUS.OPEN if expected_open else \
-                ORDER_STATUS.FILLED
-
-            blotter = Blotter(self.sim_params.data_frequency,
-                              self.env.asset_finder)
-            open_id = blotter.order(blotter.asset_finder.retrieve_asset(24),
-                                    order_size, MarketOrder())
-            open_order = blotter.open_orders[asset_24][0]
-            self.assertEqual(open_id, open_order.id)
-            blotter.hold(open_id)
-            held_order = blotter.new_orders[0]
-
-            filled_order = None
-            blotter.current_dt = dt
-            bar_data = BarData(
-                self.data_portal,
-                lambda: dt,
-                self.sim_params.data_frequency,
-                None
-            )
-            txns, _, _ = blotter.get_transactions(bar_data)
-            for txn in txns:
-                filled_order = blotter.orders[txn.order_id]
-
-            self.assertEqual(filled_order.id, held_order.id)
-            self.assertEqual(filled_order.status, expected_status)
-            self.assertEqual(filled_order.filled, expected_filled)
-            self.assertEqual(filled_order.open_amount, expected_open)
+    @parameterized.expand([(100, 0), (400, 1)])
+    def test_order_hold_fill(self, trade_amt, session_idx):
+        """
+        Verify that incoming fills will change a held order's status.
+        """
+        freq = self.sim_params.data_frequency
+        dt = self.sim_params.sessions[session_idx]
+        bar_data = BarData(self.data_portal, _const(dt), freq,
+                           self.trading_calendar, NoRestrictions())
+
+        order_size = 100
+        expected_filled = int(trade_amt * DEFAULT_EQUITY_VOLUME_SLIPPAGE_BAR_LIMIT)
+        expected_open = order_size - expected_filled
+        expected_status = ORDER_STATUS.OPEN if expected_open else \
+            ORDER_STATUS.FILLED
+
+        blotter = self._fresh_blotter()
+        asset_24 = self.asset_finder.retrieve_asset(24)
+        open_id = blotter.order(asset_24, order_size, MarketOrder())
+        open_order = blotter.open_orders[asset_24][0]
+        self.assertEqual(open_id, open_order.id)
+        blotter.hold(open_id)
+        held_order = blotter.new_orders[0]
+
+        filled_order = None
+        blotter.current_dt = dt
+        txns, _, _ = blotter.get_transactions(bar_data)
+        for txn in txns:
+            filled_order = blotter.orders[txn.order_id]
+
+        self.assertEqual(filled_order.id, held_order.id)
+        self.assertEqual(filled_order.status, expected_status)
+        self.assertEqual(filled_order.filled, expected_filled)
+        self.assertEqual(filled_order.open_amount, expected_open)
+
 
     def test_prune_orders(self):
-        blotter = Blotter(self.sim_params.data_frequency,
-                          self.env.asset_finder)
+        blotter = self._fresh_blotter()
 
-        asset_24 = blotter.asset_finder.retrieve_asset(24)
-        asset_25 = blotter.asset_finder.retrieve_asset(25)
+        asset_24 = self.asset_finder.retrieve_asset(24)
+        asset_25 = self.asset_finder.retrieve_asset(25)
 
         blotter.order(asset_24, 100, MarketOrder())
         open_order = blotter.open_orders[asset_24][0]
@@ -340,39 +380,49 @@ class BlotterTestCase(WithLogger,
 
         other_order = Order(
             dt=blotter.current_dt,
-            sid=asset_25,
+            asset=asset_25,
             amount=1
         )
 
         blotter.prune_orders([other_order])
 
+    def _run_bracket_scenario(self, blotter, dt, expected_opened):
+        """
+        Advances the blotter to dt and runs one transaction round,
+        asserting how many orders the round added to the book rather
+        than the book's absolute size, so each scenario only depends
+        on its own placements.
+        """
+        orders_before = len(blotter.orders)
+        blotter.current_dt = dt
+        bar_data = BarData(self.data_portal, _const(dt),
+                           self.sim_params.data_frequency,
+                           self.trading_calendar, NoRestrictions())
+        txns, _, closed_orders = blotter.get_transactions(bar_data)
+        self.assertEqual(len(blotter.orders) - orders_before,
+                         expected_opened)
+        return txns, closed_orders
+
     def test_bracket_order(self):
-        blotter = BracketBlotter(self.sim_params.data_frequency,
-                                 self.env.asset_finder)
-        asset_24 = blotter.asset_finder.retrieve_asset(24)
+        sessions = self.sim_params.sessions
+
+        blotter = self._fresh_blotter(blotter_cls=BracketBlotter)
+        asset_24 = self.asset_finder.retrieve_asset(24)
         base_order_id = blotter.order(asset_24, 2,
                                       BracketedMarketOrder(stop_loss=40.0,
                                                            take_profit=60.0))
         open_order = blotter.open_orders[asset_24][0]
         assert open_order.id == base_order_id
 
-        # incoming order filling
-        dt = self.sim_params.sessions[0]
-        blotter.current_dt = dt
-        bar_data = BarData(
-            self.data_portal,
-            lambda: dt,
-            self.sim_params.data_frequency,
-            None
-        )
+        # incoming order filling opens the tp + sl pair
         base_order = blotter.orders[base_order_id]
-        txns, _, closed_orders = blotter.get_transactions(bar_data)
+        _, closed_orders = self._run_bracket_scenario(
+            blotter, sessions[0], expected_opened=2)
         blotter.prune_orders(closed_orders)
 
         assert set(blotter.open_orders[asset_24]) == \
             set([base_order.tp_order, base_order.sl_order])
 
-        assert len(blotter.orders) == 3  # base + tp + sl
         assert blotter.orders[base_order.tp_order.id] == base_order.tp_order
         assert blotter.orders[base_order.sl_order.id] == base_order.sl_order
         assert base_order.tp_order.amount == - base_order.amount
@@ -381,20 +431,11 @@ class BlotterTestCase(WithLogger,
         assert blotter.orders[base_order.tp_order.id] in blotter.new_orders
         assert blotter.orders[base_order.sl_order.id] in blotter.new_orders
 
-        # order in the other direction
+        # order in the other direction partially closes the brackets
+        # without opening new ones
         blotter.order(asset_24, -1,
                       BracketedMarketOrder(stop_loss=59.0, take_profit=41.0))
-        dt = self.sim_params.sessions[1]
-        blotter.current_dt = dt
-        bar_data = BarData(
-            self.data_portal,
-            lambda: dt,
-            self.sim_params.data_frequency,
-            None
-        )
-
-        txns, _, closed_orders = blotter.get_transactions(bar_data)
-        assert len(blotter.orders) == 4  # base + tp + sl + reverse_order
+        self._run_bracket_scenario(blotter, sessions[1], expected_opened=0)
         assert base_order.tp_order.amount == -1
         assert base_order.sl_order.amount == -1
 
@@ -403,17 +444,7 @@ class BlotterTestCase(WithLogger,
         new_order_id = blotter.order(asset_24, -5,
                                      BracketedMarketOrder(stop_loss=59.0,
                                                           take_profit=41.0))
-        dt = self.sim_params.sessions[2]
-        blotter.current_dt = dt
-        bar_data = BarData(
-            self.data_portal,
-            lambda: dt,
-            self.sim_params.data_frequency,
-            None
-        )
-
-        txns, _, closed_orders = blotter.get_transactions(bar_data)
-        assert len(blotter.orders) == 7  # 4 + new_base + new tp and sl
+        self._run_bracket_scenario(blotter, sessions[2], expected_opened=2)
         new_order = blotter.orders[new_order_id]
         assert new_order.tp_order.amount == 4
         assert new_order.sl_order.amount == 4
@@ -29,13 +29,15 @@ setup(
 
     # Dependent packages (distributions)
     install_requires=[
-        'pandas>=0.16',
-        'zipline>1.0',
+        'pandas>=2.0',
+        'zipline-reloaded>=3.0',
         'logbook',
-        'psycopg2',
+        'aiohttp',
+        'pyarrow',
+        'psycopg2-binary',
         'oandapy',
     ],
     dependency_links=[
-        'git+git://github.com/oanda/oandapy@master#egg=oandapy'
+        'git+https://github.com/oanda/oandapy@master#egg=oandapy'
     ],
 )